@@ -0,0 +1,33 @@
+"""
+Optional compiled build for link-notation-objects-codec.
+
+All project metadata lives in pyproject.toml. This file only exists to
+compile the pure-Python codec module with Cython when ENABLE_LNOC_CYTHON
+is set in the environment:
+
+    ENABLE_LNOC_CYTHON=1 pip install --no-build-isolation .
+
+The compiled extension is placed next to codec.py and takes precedence on
+import; without it the pure-Python module is used unchanged.
+"""
+
+import os
+
+from setuptools import setup
+
+ext_modules = []
+
+if os.environ.get("ENABLE_LNOC_CYTHON", "").lower() in ("1", "true", "yes"):
+    from Cython.Build import cythonize
+
+    ext_modules = cythonize(
+        ["src/link_notation_objects_codec/codec.py"],
+        compiler_directives={
+            "language_level": 3,
+            # Type hints must not become exact-type checks: list and dict
+            # subclasses are valid input to the encoders
+            "annotation_typing": False,
+        },
+    )
+
+setup(ext_modules=ext_modules)
@@ -5,7 +5,14 @@ This library provides serialization and deserialization of Python objects to/fro
 Links Notation format, with support for circular references and complex object graphs.
 """
 
-from .codec import ObjectCodec, decode, encode
+from .codec import ObjectCodec, decode, decode_many, encode, encode_many, encode_to_writer
 
 __version__ = "0.1.0"
-__all__ = ["ObjectCodec", "encode", "decode"]
+__all__ = [
+    "ObjectCodec",
+    "encode",
+    "encode_to_writer",
+    "encode_many",
+    "decode",
+    "decode_many",
+]
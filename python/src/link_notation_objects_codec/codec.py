@@ -1,315 +1,1022 @@
 """Object encoder/decoder for Links Notation format."""
 
-import base64
 import math
-from typing import Any, Dict, List, Optional, Set
+import re
+import sys
+import threading
+from binascii import a2b_base64, b2a_base64
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Callable, ClassVar, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-from links_notation import Link, Parser, format_links
+from links_notation import Link, Parser
+
+try:
+    # Optional SIMD-accelerated base64 implementation
+    import pybase64
+except ImportError:  # pragma: no cover - depends on the environment
+    pybase64 = None
+
+
+if pybase64 is not None:  # pragma: no cover - depends on the environment
+
+    def _b64encode_str(value: str) -> str:
+        """Base64-encode the UTF-8 bytes of a string."""
+        return pybase64.b64encode_as_string(value.encode('utf-8'))
+
+else:
+
+    def _b64encode_str(value: str) -> str:
+        """Base64-encode the UTF-8 bytes of a string."""
+        return b2a_base64(value.encode('utf-8'), newline=False).decode('ascii')
+
+
+def _b64decode_str(value: str) -> str:
+    """Decode a base64 payload back into a UTF-8 string."""
+    # Always binascii, even with pybase64 installed: the two disagree on
+    # data after the padding, and decoded values must not depend on extras
+    return a2b_base64(value).decode('utf-8')
+
+
+# Strings up to this length have their base64 form cached; repeated dict keys
+# and short values are then encoded with a single cache lookup
+_B64_CACHE_MAX_LENGTH = 64
+
+
+@lru_cache(maxsize=4096)
+def _b64encode_short_str(value: str) -> str:
+    """Base64-encode a short string, memoising the result."""
+    return _b64encode_str(value)
+
+
+# Upper bound on automatically cached dict key tokens per codec
+_KEY_TOKENS_MAX = 4096
+
+# Base64 payloads up to this length (1 KiB) are memoised for a single decode
+_B64_DECODE_MEMO_MAX_LENGTH = 1368
+
+# Base64 payloads up to this length (66 UTF-8 bytes) are decoded through a
+# cache, so repeated keys and values decode to one shared str object
+_B64_DECODE_CACHE_MAX_LENGTH = 88
+
+
+@lru_cache(maxsize=4096)
+def _b64decode_short_str(value: str) -> str:
+    """Decode a short base64 payload, memoising the result."""
+    return _b64decode_str(value)
+
+
+def _str_payload(value: str) -> str:
+    """Return the base64 payload written for a str."""
+    if len(value) <= _B64_CACHE_MAX_LENGTH:
+        return _b64encode_short_str(value)
+    return _b64encode_str(value)
+
+
+def _float_payload(value: float) -> str:
+    """Return the text written for a float, including NaN and infinities."""
+    # One check covers the common case; str() of a finite float is its repr
+    if math.isfinite(value):
+        return str(value)
+    if value != value:
+        return "NaN"
+    return "Infinity" if value > 0 else "-Infinity"
+
+
+# Type markers, interned once so comparisons and dispatch lookups against
+# them hit the identity fast path
+_TAG_NONE = sys.intern("None")
+_TAG_BOOL = sys.intern("bool")
+_TAG_INT = sys.intern("int")
+_TAG_FLOAT = sys.intern("float")
+_TAG_STR = sys.intern("str")
+_TAG_LIST = sys.intern("list")
+_TAG_DICT = sys.intern("dict")
+_TAG_REF = sys.intern("ref")
+
+# Complete encoded forms of payload-free values, built once
+_TOKEN_NONE = f"({_TAG_NONE})"
+_TOKEN_TRUE = f"({_TAG_BOOL} True)"
+_TOKEN_FALSE = f"({_TAG_BOOL} False)"
+
+# Item types whose lists are written with a single join: type -> (type
+# marker, payload function). Ints are handled separately, see _BATCHED_INTS.
+_BATCHED_ITEMS: Dict[type, Tuple[str, Callable[[Any], str]]] = {
+    str: (_TAG_STR, _str_payload),
+    float: (_TAG_FLOAT, _float_payload),
+    bool: (_TAG_BOOL, str),
+}
+
+# Lists of ints are joined too, but only when they start outside the
+# small-int range: the preformatted small-int tokens beat str() per item
+_BATCHED_INTS: Tuple[str, Callable[[Any], str]] = (_TAG_INT, str)
+
+# Preformatted tokens for small ints, as written for list items (with the
+# leading separator) and dict values (with the closing pair paren)
+_SMALL_INT_MIN = -5
+_SMALL_INT_MAX = 256
+_SMALL_INT_ITEMS = tuple(
+    f" ({_TAG_INT} {number})" for number in range(_SMALL_INT_MIN, _SMALL_INT_MAX + 1)
+)
+_SMALL_INT_VALUES = tuple(
+    f"({_TAG_INT} {number}))" for number in range(_SMALL_INT_MIN, _SMALL_INT_MAX + 1)
+)
+
+# Preformatted "obj_N" IDs for the first objects of an encode
+_OBJ_NAMES_COUNT = 1024
+_OBJ_NAMES = tuple(f"obj_{number}" for number in range(_OBJ_NAMES_COUNT))
+
+
+def _obj_name(number: int) -> str:
+    """Return the "obj_N" ID for an object number."""
+    if number < _OBJ_NAMES_COUNT:
+        return _OBJ_NAMES[number]
+    return f"obj_{number}"
+
+
+# A parsed link as a lightweight (id, values) tuple: atoms are (text, ()) and
+# parenthesized groups are (None, [child, ...]).
+_Node = Tuple[Optional[str], Any]
+
+_EMPTY: Tuple[()] = ()
+
+# Sink for encoded text fragments, e.g. list.append or a file's write method
+_Write = Callable[[str], Any]
+
+# An open container while encoding: (items iterator, is_dict)
+_EncodeFrame = Tuple[Iterator[Any], bool]
+
+# A container being filled while decoding: (container, remaining value nodes, is_dict)
+_DecodeFrame = Tuple[Any, Iterator[_Node], bool]
+
+# Characters outside the subset of links-notation the encoder produces
+# (quoted references, "id:" definitions, multi-line indentation and any
+# whitespace other than a plain space).
+_PARSER_ONLY_SYNTAX = re.compile(r"[:'\"]|[^\S ]")
+
+# Notation holding nothing but one scalar link, e.g. "(int 42)" or "(None)"
+_SCALAR_NOTATION = re.compile(r" *\((None|bool|int|float|str)(?: ([^\s()'\":]+))?\) *")
+
+# Types encoded as a single link, with no memo or stack involved
+_SCALAR_TYPES = frozenset((type(None), bool, int, float, str))
+
+
+class _NotCanonicalError(Exception):
+    """Raised when notation departs from what the encoder produces."""
+
+
+def _float_from_text(text: str) -> float:
+    """Convert a float payload, including the special NaN and infinity values."""
+    if text == "NaN":
+        return math.nan
+    elif text == "Infinity":
+        return math.inf
+    elif text == "-Infinity":
+        return -math.inf
+    else:
+        return float(text)
+
+
+def _tokenize(notation: str) -> Optional[List[str]]:
+    """
+    Split notation into "(", ")" and atom tokens.
+
+    Args:
+        notation: String in Links Notation format
+
+    Returns:
+        Token strings, or None if the notation needs the full parser
+    """
+    if _PARSER_ONLY_SYNTAX.search(notation):
+        return None
+    # Padding the parentheses lets str.split do the scanning in C
+    return notation.replace("(", " ( ").replace(")", " ) ").split()
+
+
+def _parse(tokens: List[str]) -> Optional[_Node]:
+    """
+    Parse the tokens of notation produced by the encoder into a tuple tree.
+
+    Only a single parenthesized top-level link is supported. Anything else
+    returns None so the caller can fall back to the full links-notation parser.
+
+    Args:
+        tokens: Tokens from _tokenize
+
+    Returns:
+        Root node, or None if the notation needs the full parser
+    """
+    stack: List[List[_Node]] = []
+    root: Optional[_Node] = None
+    for token in tokens:
+        if token == '(':
+            if root is not None:
+                return None
+            stack.append([])
+        elif token == ')':
+            if not stack:
+                return None
+            node = (None, stack.pop())
+            if stack:
+                stack[-1].append(node)
+            else:
+                root = node
+        else:
+            if not stack:
+                return None
+            stack[-1].append((token, _EMPTY))
+
+    if stack:
+        return None
+    return root
+
+
+def _link_to_node(link: Link) -> _Node:
+    """
+    Convert a links-notation Link into the tuple form used by the decoder.
+
+    Args:
+        link: Link returned by the links-notation parser
+
+    Returns:
+        Equivalent (id, values) node
+    """
+    if not link.values:
+        return (link.id, _EMPTY)
+    return (link.id, [_link_to_node(value) for value in link.values])
 
 
 class ObjectCodec:
     """Codec for encoding/decoding Python objects to/from Links Notation."""
 
+    __slots__ = (
+        "parser",
+        "_encode_memo",
+        "_encode_keepalive",
+        "_key_tokens",
+        "_decode_memo",
+        "_decode_str_memo",
+    )
+
     # Type identifiers
-    TYPE_NONE = "None"
-    TYPE_BOOL = "bool"
-    TYPE_INT = "int"
-    TYPE_FLOAT = "float"
-    TYPE_STR = "str"
-    TYPE_LIST = "list"
-    TYPE_DICT = "dict"
-    TYPE_REF = "ref"
+    TYPE_NONE = _TAG_NONE
+    TYPE_BOOL = _TAG_BOOL
+    TYPE_INT = _TAG_INT
+    TYPE_FLOAT = _TAG_FLOAT
+    TYPE_STR = _TAG_STR
+    TYPE_LIST = _TAG_LIST
+    TYPE_DICT = _TAG_DICT
+    TYPE_REF = _TAG_REF
 
     def __init__(self) -> None:
         """Initialize the codec."""
         self.parser = Parser()
-        # For tracking object identity during encoding
-        self._encode_memo: Dict[int, str] = {}
-        self._encode_counter: int = 0
+        # For tracking object identity during encoding: id(obj) -> N in "obj_N"
+        self._encode_memo: Dict[int, int] = {}
+        # Strong references to memoised objects, so their ids stay unique
+        self._encode_keepalive: List[Any] = []
+        # Encoded " ((str <base64>) " prefixes of dict keys, kept across calls
+        self._key_tokens: Dict[str, str] = {}
         # For tracking references during decoding
         self._decode_memo: Dict[str, Any] = {}
+        # Decoded strings by base64 payload, so repeats share one str object
+        self._decode_str_memo: Dict[str, str] = {}
 
-    def _make_link(self, *parts: str) -> Link:
+    def encode(self, obj: Any) -> str:
         """
-        Create a Link from string parts.
+        Encode a Python object to Links Notation format.
 
         Args:
-            *parts: String parts to include in the link
+            obj: The Python object to encode
 
         Returns:
-            Link object with parts as Link values
+            String representation in Links Notation format
         """
-        # Each part becomes a Link with that id
-        values = [Link(link_id=part) for part in parts]
-        return Link(values=values)
+        out: List[str] = []
+        if type(obj) in _SCALAR_TYPES:
+            # A lone scalar leaves no memo state to reset
+            self._ENCODERS[type(obj)](self, obj, out.append)
+            return out[0]
 
-    def encode(self, obj: Any) -> str:
+        self._encode_root(obj, out.append)
+        return ''.join(out)
+
+    def encode_to_writer(self, obj: Any, writer: Any) -> None:
         """
-        Encode a Python object to Links Notation format.
+        Encode a Python object to Links Notation, streaming it to a writer.
+
+        The notation is written in small fragments as it is produced, so the
+        full text is never held in memory. The output is identical to
+        ``encode(obj)``.
 
         Args:
             obj: The Python object to encode
+            writer: Object with a ``write(str)`` method, such as a text file
+        """
+        self._encode_root(obj, writer.write)
+
+    def encode_many(self, objs: Iterable[Any]) -> List[str]:
+        """
+        Encode several Python objects to Links Notation format.
+
+        Each object is encoded independently, exactly as by ``encode``, so
+        object IDs and references are not shared between the results. The
+        codec's caches, such as encoded dict keys, stay warm for the batch.
+
+        Args:
+            objs: The Python objects to encode
 
         Returns:
-            String representation in Links Notation format
+            One Links Notation string per object, in order
+        """
+        encode = self.encode
+        return [encode(obj) for obj in objs]
+
+    def register_keys(self, keys: Iterable[str]) -> None:
         """
-        # Reset memo for each encode operation
-        self._encode_memo = {}
-        self._encode_counter = 0
+        Pre-encode dict keys that this codec will see repeatedly.
 
-        link = self._encode_value(obj)
-        return format_links([link])
+        Dicts sharing the same keys (records of one "shape") then have each
+        registered key written from a cached token. Short keys are also
+        cached automatically as they are encountered; registering is useful
+        for long keys, or to warm the cache up front. The output is unchanged.
 
-    def decode(self, notation: str) -> Any:
+        Args:
+            keys: The str keys to pre-encode
+
+        Raises:
+            TypeError: If a key is not a str
+        """
+        for key in keys:
+            if type(key) is not str:
+                raise TypeError(f"Dict keys to register must be str, got {type(key)}")
+            self._key_tokens[key] = f" (({_TAG_STR} {_str_payload(key)}) "
+
+    def _encode_root(self, obj: Any, write: _Write) -> None:
+        """
+        Encode a top-level value, releasing the memo afterwards.
+
+        Every memoised object is kept alive until the encode finishes. Without
+        this, a temporary container (e.g. one produced by a subclass's
+        ``__iter__``) could be freed mid-encode and its id reused by a later
+        object, which would then be wrongly encoded as a reference.
+
+        Args:
+            obj: The value to encode
+            write: Callable that receives the string fragments
+        """
+        try:
+            self._encode_value(obj, write)
+        finally:
+            # Start the next encode fresh, and don't hold on to the caller's
+            # objects (or a large memo) in the meantime
+            self._encode_memo.clear()
+            self._encode_keepalive.clear()
+
+    def decode(self, notation: Union[str, bytes]) -> Any:
         """
         Decode Links Notation format to a Python object.
 
+        Args:
+            notation: String in Links Notation format, or its UTF-8 bytes
+
+        Returns:
+            Reconstructed Python object
+        """
+        if not isinstance(notation, str):
+            # Convert bytes read from a file or socket once, up front
+            notation = str(notation, 'utf-8')
+
+        try:
+            return self._decode_notation(notation)
+        finally:
+            # Start the next decode fresh, and don't keep the decoded
+            # containers alive through the memo
+            self._decode_memo.clear()
+            self._decode_str_memo.clear()
+
+    def decode_many(self, notations: Iterable[Union[str, bytes]]) -> List[Any]:
+        """
+        Decode several Links Notation strings to Python objects.
+
+        Each notation is decoded independently, exactly as by ``decode``.
+
+        Args:
+            notations: Strings in Links Notation format, or their UTF-8 bytes
+
+        Returns:
+            One reconstructed Python object per notation, in order
+        """
+        decode = self.decode
+        return [decode(notation) for notation in notations]
+
+    def _decode_notation(self, notation: str) -> Any:
+        """
+        Decode notation, using the fastest path that accepts it.
+
         Args:
             notation: String in Links Notation format
 
         Returns:
             Reconstructed Python object
         """
-        # Reset memo for each decode operation
-        self._decode_memo = {}
+        scalar = _SCALAR_NOTATION.fullmatch(notation)
+        if scalar is not None:
+            # A lone scalar is decoded straight from the match, skipping the
+            # tokens and the container stack
+            marker, payload = scalar.groups()
+            values: List[_Node] = [(marker, _EMPTY)]
+            if payload is not None:
+                values.append((payload, _EMPTY))
+            return self._DECODERS[marker](self, values, [])
+
+        tokens = _tokenize(notation)
+        if tokens is not None:
+            try:
+                return self._decode_tokens(tokens)
+            except (_NotCanonicalError, LookupError, ValueError):
+                # Let the general decoder handle (or report) anything unusual
+                self._decode_memo.clear()
+
+        root = _parse(tokens) if tokens is not None else None
+        if root is None:
+            # Fall back to the full parser for notation outside the encoder's subset
+            links = self.parser.parse(notation)
+            if not links:
+                return None
+            root = _link_to_node(links[0])
+
+        return self._decode_link(root)
+
+    def _decode_tokens(self, tokens: List[str]) -> Any:
+        """
+        Decode the tokens of canonical encoder output directly to Python values.
 
-        links = self.parser.parse(notation)
-        if not links:
-            return None
+        Values are built straight from the token list, without an intermediate
+        tree, and containers are filled from an explicit stack. Anything the
+        encoder would not have produced raises _NotCanonicalError (or LookupError /
+        ValueError), so the caller can retry with the general decoder.
 
-        return self._decode_link(links[0])
+        Args:
+            tokens: Tokens from _tokenize
 
-    def _encode_value(self, obj: Any, visited: Optional[Set[int]] = None) -> Link:
+        Returns:
+            Decoded Python value
         """
-        Encode a value into a Link.
+        read = self._read_token_value
+        value, i, is_dict = read(tokens, 0)
+        result = value
+
+        # Each entry holds a container being filled, whether it is a dict, and
+        # whether it is a dict value that is followed by its pair's ")"
+        stack: List[Tuple[Any, bool, bool]] = []
+        if is_dict is not None:
+            stack.append((value, is_dict, False))
+
+        while stack:
+            container, is_dict, closes_pair = stack[-1]
+            while True:
+                token = tokens[i]
+                if token == ")":
+                    # End of the container (and of the pair holding it)
+                    i += 1
+                    if closes_pair:
+                        if tokens[i] != ")":
+                            raise _NotCanonicalError
+                        i += 1
+                    stack.pop()
+                    break
+
+                if is_dict:
+                    # Each entry is a (key value) pair with a scalar key
+                    if token != "(":
+                        raise _NotCanonicalError
+                    key, i, child = read(tokens, i + 1)
+                    if child is not None:
+                        raise _NotCanonicalError
+
+                    if (
+                        tokens[i] == "("
+                        and tokens[i + 1] == _TAG_INT
+                        and tokens[i + 3] == ")"
+                        and tokens[i + 4] == ")"
+                    ):
+                        container[key] = int(tokens[i + 2])
+                        i += 5
+                        continue
+
+                    value, i, child = read(tokens, i)
+                    container[key] = value
+                    if child is not None:
+                        # Fill the child container first
+                        stack.append((value, child, True))
+                        break
+                    if tokens[i] != ")":
+                        raise _NotCanonicalError
+                    i += 1
+                else:
+                    if token == "(" and tokens[i + 1] == _TAG_INT and tokens[i + 3] == ")":
+                        # Inline the most common item type
+                        container.append(int(tokens[i + 2]))
+                        i += 4
+                        continue
+
+                    value, i, child = read(tokens, i)
+                    container.append(value)
+                    if child is not None:
+                        # Fill the child container first
+                        stack.append((value, child, False))
+                        break
+
+        if i != len(tokens):
+            raise _NotCanonicalError
+        return result
+
+    def _read_token_value(self, tokens: List[str], i: int) -> Tuple[Any, int, Optional[bool]]:
+        """
+        Read the value link starting at ``tokens[i]``.
+
+        Lists and dicts are returned empty (and registered for references);
+        their items follow in the token list.
 
         Args:
-            obj: The value to encode
-            visited: Set of object IDs currently being processed (for cycle detection)
+            tokens: Tokens from _tokenize
+            i: Index of the value's opening "("
 
         Returns:
-            Link object
+            The value, the index after it, and for containers whether it is a
+            dict (None for scalars)
         """
-        if visited is None:
-            visited = set()
+        if tokens[i] != "(":
+            raise _NotCanonicalError
+        marker = tokens[i + 1]
+        payload = tokens[i + 2]
+
+        if payload == ")":
+            # Links without a payload
+            if marker == _TAG_NONE:
+                return None, i + 3, None
+            if marker == _TAG_STR:
+                return "", i + 3, None
+            raise _NotCanonicalError
+        if payload == "(":
+            raise _NotCanonicalError
+
+        if marker == _TAG_LIST:
+            items: List[Any] = []
+            self._decode_memo[payload] = items
+            return items, i + 3, False
+        if marker == _TAG_DICT:
+            entries: Dict[Any, Any] = {}
+            self._decode_memo[payload] = entries
+            return entries, i + 3, True
+
+        if tokens[i + 3] != ")":
+            raise _NotCanonicalError
+        if marker == _TAG_INT:
+            return int(payload), i + 4, None
+        if marker == _TAG_STR:
+            return self._str_from_payload(payload), i + 4, None
+        if marker == _TAG_BOOL:
+            return payload == "True", i + 4, None
+        if marker == _TAG_FLOAT:
+            return _float_from_text(payload), i + 4, None
+        if marker == _TAG_REF:
+            return self._decode_memo[payload], i + 4, None
+        raise _NotCanonicalError
+
+    def _encode_value(self, obj: Any, write: _Write) -> None:
+        """
+        Encode a value, passing its Links Notation text to ``write``.
 
-        obj_id = id(obj)
+        The notation is emitted directly instead of building a tree of Link
+        objects first. Every emitted id (type markers, numbers, base64 and
+        object ids) is free of characters that links-notation would quote,
+        so the output matches what ``format_links`` produces for the same tree.
 
-        # Check if we've seen this object before (for circular references and shared objects)
-        # Only track mutable objects (lists, dicts)
-        if isinstance(obj, (list, dict)) and obj_id in self._encode_memo:
-            # Return a reference to the previously encoded object
-            ref_id = self._encode_memo[obj_id]
-            return self._make_link(self.TYPE_REF, ref_id)
-
-        # For mutable objects, check if we're in a cycle
-        if isinstance(obj, (list, dict)):
-            if obj_id in visited:
-                # We're in a cycle, create a reference
-                if obj_id not in self._encode_memo:
-                    # Assign an ID for this object
-                    ref_id = f"obj_{self._encode_counter}"
-                    self._encode_counter += 1
-                    self._encode_memo[obj_id] = ref_id
-                ref_id = self._encode_memo[obj_id]
-                return self._make_link(self.TYPE_REF, ref_id)
-
-            # Add to visited set
-            visited = visited | {obj_id}
-
-            # Assign an ID to this object
-            ref_id = f"obj_{self._encode_counter}"
-            self._encode_counter += 1
-            self._encode_memo[obj_id] = ref_id
-
-        # Encode based on type
-        if obj is None:
-            return self._make_link(self.TYPE_NONE)
-
-        elif isinstance(obj, bool):
-            # Must check bool before int because bool is a subclass of int
-            return self._make_link(self.TYPE_BOOL, str(obj))
-
-        elif isinstance(obj, int):
-            return self._make_link(self.TYPE_INT, str(obj))
-
-        elif isinstance(obj, float):
-            # Handle special float values
-            if math.isnan(obj):
-                return self._make_link(self.TYPE_FLOAT, "NaN")
-            elif math.isinf(obj):
-                if obj > 0:
-                    return self._make_link(self.TYPE_FLOAT, "Infinity")
+        Lists and dicts are walked with an explicit stack instead of
+        recursion, so the nesting depth is not limited by the interpreter's
+        recursion limit.
+
+        Args:
+            obj: The value to encode
+            write: Callable that receives the string fragments
+        """
+        # Dispatch on the exact type with a single dict lookup
+        encoders = self._ENCODERS
+        encoder = encoders.get(type(obj)) or self._find_encoder(type(obj))
+        frame = encoder(self, obj, write)
+        if frame is None:
+            return
+
+        key_tokens = self._key_tokens
+
+        # Each entry holds an open container and the text that closes it
+        stack: List[Tuple[_EncodeFrame, str]] = [(frame, ")")]
+        while stack:
+            (items, is_dict), closing = stack[-1]
+
+            if is_dict:
+                for key, value in items:
+                    # Encode each entry as a (key value) pair, writing str keys
+                    # from the key token cache and inlining int values
+                    if type(key) is str:
+                        token = key_tokens.get(key)
+                        if token is None:
+                            token = self._key_token(key)
+                        write(token)
+                    else:
+                        write(" (")
+                        self._encode_value(key, write)
+                        write(" ")
+                    if type(value) is int:
+                        if _SMALL_INT_MIN <= value <= _SMALL_INT_MAX:
+                            write(_SMALL_INT_VALUES[value - _SMALL_INT_MIN])
+                        else:
+                            write(f"({_TAG_INT} {value}))")
+                        continue
+
+                    encoder = encoders.get(type(value)) or self._find_encoder(type(value))
+                    child = encoder(self, value, write)
+                    if child is not None:
+                        # Descend; the pair is closed after the child container
+                        stack.append((child, "))"))
+                        break
+                    write(")")
                 else:
-                    return self._make_link(self.TYPE_FLOAT, "-Infinity")
+                    # All entries written
+                    write(closing)
+                    stack.pop()
             else:
-                return self._make_link(self.TYPE_FLOAT, str(obj))
-
-        elif isinstance(obj, str):
-            # Encode strings as base64 to handle special characters, newlines, etc.
-            b64_encoded = base64.b64encode(obj.encode('utf-8')).decode('ascii')
-            return self._make_link(self.TYPE_STR, b64_encoded)
-
-        elif isinstance(obj, list):
-            ref_id = self._encode_memo[obj_id]
-            # Encode as: (list ref_id item0 item1 item2 ...)
-            parts = [Link(link_id=self.TYPE_LIST), Link(link_id=ref_id)]
-            for item in obj:
-                # Encode each item
-                item_link = self._encode_value(item, visited)
-                parts.append(item_link)
-            return Link(values=parts)
-
-        elif isinstance(obj, dict):
-            ref_id = self._encode_memo[obj_id]
-            # Encode as: (dict ref_id (key0 value0) (key1 value1) ...)
-            parts = [Link(link_id=self.TYPE_DICT), Link(link_id=ref_id)]
-            for key, value in obj.items():
-                # Encode key and value
-                key_link = self._encode_value(key, visited)
-                value_link = self._encode_value(value, visited)
-                # Create a pair link
-                pair = Link(values=[key_link, value_link])
-                parts.append(pair)
-            return Link(values=parts)
+                for item in items:
+                    if type(item) is int:
+                        # Inline the most common item type
+                        if _SMALL_INT_MIN <= item <= _SMALL_INT_MAX:
+                            write(_SMALL_INT_ITEMS[item - _SMALL_INT_MIN])
+                        else:
+                            write(f" ({_TAG_INT} {item})")
+                        continue
+
+                    write(" ")
+                    encoder = encoders.get(type(item)) or self._find_encoder(type(item))
+                    child = encoder(self, item, write)
+                    if child is not None:
+                        # Descend into the child container
+                        stack.append((child, ")"))
+                        break
+                else:
+                    # All items written
+                    write(closing)
+                    stack.pop()
 
-        else:
-            raise TypeError(f"Unsupported type: {type(obj)}")
+    def _key_token(self, key: str) -> str:
+        """
+        Build the text that opens a dict entry with a str key.
+
+        Short keys are added to the key token cache, up to a fixed number of
+        entries, so later dicts with the same keys reuse the text.
+
+        Args:
+            key: The dict key
+
+        Returns:
+            The " ((str <base64>) " prefix for the entry
+        """
+        token = f" (({_TAG_STR} {_str_payload(key)}) "
+        if len(key) <= _B64_CACHE_MAX_LENGTH and len(self._key_tokens) < _KEY_TOKENS_MAX:
+            self._key_tokens[key] = token
+        return token
 
-    def _decode_link(self, link: Link) -> Any:
+    def _find_encoder(self, cls: type) -> Callable[..., Optional[_EncodeFrame]]:
         """
-        Decode a Link into a Python value.
+        Find the encoder for a subclass of a supported type.
 
         Args:
-            link: Link object to decode
+            cls: Type of the value being encoded
 
         Returns:
-            Decoded Python value
+            Encoder registered for the nearest supported base class
+
+        Raises:
+            TypeError: If no base class of ``cls`` is supported
         """
-        if not link.values:
-            # Empty link - this might be a simple id
-            if link.id:
-                return link.id
+        for base in cls.__mro__:
+            encoder = self._ENCODERS.get(base)
+            if encoder is not None:
+                return encoder
+        raise TypeError(f"Unsupported type: {cls}")
+
+    def _encode_none(self, obj: None, write: _Write) -> None:
+        """Encode None."""
+        write(_TOKEN_NONE)
+
+    def _encode_bool(self, obj: bool, write: _Write) -> None:
+        """Encode a bool."""
+        write(_TOKEN_TRUE if obj else _TOKEN_FALSE)
+
+    def _encode_int(self, obj: int, write: _Write) -> None:
+        """Encode an int."""
+        write(f"({_TAG_INT} {obj})")
+
+    def _encode_float(self, obj: float, write: _Write) -> None:
+        """Encode a float, including the special NaN and infinity values."""
+        write(f"({_TAG_FLOAT} {_float_payload(obj)})")
+
+    def _encode_str(self, obj: str, write: _Write) -> None:
+        """Encode a str."""
+        # Encode strings as base64 to handle special characters, newlines, etc.
+        write(f"({_TAG_STR} {_str_payload(obj)})")
+
+    def _begin_container(self, obj: Any, write: _Write) -> Optional[str]:
+        """
+        Assign an object ID to a list or dict, or emit a reference to it.
+
+        Objects are numbered in encounter order, so the number is simply the
+        size of the memo.
+
+        Args:
+            obj: The list or dict being encoded
+            write: Callable that receives the string fragments
+
+        Returns:
+            The new "obj_N" ID, or None if a reference was emitted instead
+        """
+        obj_id = id(obj)
+        memo = self._encode_memo
+
+        # Check if we've seen this object before (for circular references and shared objects)
+        number = memo.get(obj_id)
+        if number is not None:
+            # Emit a reference to the previously encoded object
+            write(f"({_TAG_REF} {_obj_name(number)})")
             return None
 
-        # Get the type marker from the first value
-        first_value = link.values[0]
-        if not hasattr(first_value, 'id') or not first_value.id:
-            # Not a type marker we recognize
+        # Assign an ID to this object
+        number = len(memo)
+        memo[obj_id] = number
+        self._encode_keepalive.append(obj)
+        if number < _OBJ_NAMES_COUNT:
+            return _OBJ_NAMES[number]
+        return f"obj_{number}"
+
+    def _encode_list(self, obj: List[Any], write: _Write) -> Optional[_EncodeFrame]:
+        """
+        Start encoding a list as: (list ref_id item0 item1 item2 ...).
+
+        Lists holding only strs, only floats, only bools or only (mostly
+        large) ints are written in one go with str.join.
+
+        Returns:
+            Frame for writing the items, or None if the list was written
+            completely (or a reference was emitted)
+        """
+        ref_id = self._begin_container(obj, write)
+        if ref_id is None:
             return None
 
-        type_marker = first_value.id
+        if type(obj) is list and obj:
+            # Only scan the item types when the first item is batchable
+            first = obj[0]
+            batch = _BATCHED_ITEMS.get(type(first))
+            if type(first) is int and not _SMALL_INT_MIN <= first <= _SMALL_INT_MAX:
+                batch = _BATCHED_INTS
+            if batch is not None and len(set(map(type, obj))) == 1:
+                tag, payload = batch
+                separator = f") ({tag} "
+                write(f"({_TAG_LIST} {ref_id} ({tag} {separator.join(map(payload, obj))}))")
+                return None
+
+        write(f"({_TAG_LIST} {ref_id}")
+        return (iter(obj), False)
+
+    def _encode_dict(self, obj: Dict[Any, Any], write: _Write) -> Optional[_EncodeFrame]:
+        """
+        Start encoding a dict as: (dict ref_id (key0 value0) (key1 value1) ...).
 
-        if type_marker == self.TYPE_NONE:
+        Returns:
+            Frame for writing the entries, or None if a reference was emitted
+        """
+        ref_id = self._begin_container(obj, write)
+        if ref_id is None:
             return None
 
-        elif type_marker == self.TYPE_BOOL:
-            if len(link.values) > 1:
-                bool_value = link.values[1]
-                if hasattr(bool_value, 'id'):
-                    return bool_value.id == "True"
-            return False
-
-        elif type_marker == self.TYPE_INT:
-            if len(link.values) > 1:
-                int_value = link.values[1]
-                if hasattr(int_value, 'id'):
-                    return int(int_value.id)
-            return 0
-
-        elif type_marker == self.TYPE_FLOAT:
-            if len(link.values) > 1:
-                float_value = link.values[1]
-                if hasattr(float_value, 'id'):
-                    value_str = float_value.id
-                    if value_str == "NaN":
-                        return math.nan
-                    elif value_str == "Infinity":
-                        return math.inf
-                    elif value_str == "-Infinity":
-                        return -math.inf
-                    else:
-                        return float(value_str)
-            return 0.0
-
-        elif type_marker == self.TYPE_STR:
-            if len(link.values) > 1:
-                str_value = link.values[1]
-                if hasattr(str_value, 'id'):
-                    b64_str = str_value.id
-                    # Decode from base64
-                    try:
-                        decoded_bytes = base64.b64decode(b64_str)
-                        return decoded_bytes.decode('utf-8')
-                    except Exception:
-                        # If decode fails, return the raw value
-                        return b64_str
-            return ""
-
-        elif type_marker == self.TYPE_REF:
-            # This is a reference to a previously decoded object
-            if len(link.values) > 1:
-                ref_value = link.values[1]
-                if hasattr(ref_value, 'id'):
-                    ref_id = ref_value.id
-                    if ref_id in self._decode_memo:
-                        return self._decode_memo[ref_id]
-            raise ValueError("Unknown reference in link")
-
-        elif type_marker == self.TYPE_LIST:
-            if len(link.values) < 2:
-                return []
-
-            ref_value = link.values[1]
-            ref_id = ref_value.id if hasattr(ref_value, 'id') else None
-
-            # Create the list object first (to handle circular references)
-            result: List[Any] = []
-            if ref_id:
-                self._decode_memo[ref_id] = result
-
-            # Decode items
-            for i in range(2, len(link.values)):
-                item_link = link.values[i]
-                decoded_item = self._decode_link(item_link)
-                result.append(decoded_item)
-
-            return result
-
-        elif type_marker == self.TYPE_DICT:
-            if len(link.values) < 2:
-                return {}
-
-            ref_value = link.values[1]
-            ref_id = ref_value.id if hasattr(ref_value, 'id') else None
-
-            # Create the dict object first (to handle circular references)
-            result_dict: Dict[Any, Any] = {}
-            if ref_id:
-                self._decode_memo[ref_id] = result_dict
-
-            # Decode key-value pairs
-            for i in range(2, len(link.values)):
-                pair_link = link.values[i]
-                if hasattr(pair_link, 'values') and len(pair_link.values) >= 2:
+        write(f"({_TAG_DICT} {ref_id}")
+        return (iter(obj.items()), True)
+
+    def _decode_link(self, link: _Node) -> Any:
+        """
+        Decode a parsed link into a Python value.
+
+        Lists and dicts are filled from an explicit stack instead of
+        recursion, so the nesting depth is not limited by the interpreter's
+        recursion limit.
+
+        Args:
+            link: Parsed link as an (id, values) node
+
+        Returns:
+            Decoded Python value
+        """
+        stack: List[_DecodeFrame] = []
+        result = self._decode_node(link, stack)
+
+        while stack:
+            container, items, is_dict = stack[-1]
+            depth = len(stack)
+
+            if is_dict:
+                # Decode key-value pairs
+                for pair in items:
+                    pair_values = pair[1]
+                    if len(pair_values) < 2:
+                        continue
                     # This should be a link with 2 values: key and value
-                    key_link = pair_link.values[0]
-                    value_link = pair_link.values[1]
+                    key = self._decode_node(pair_values[0], stack)
+                    value_values = pair_values[1][1]
+                    if len(value_values) > 1 and value_values[0][0] == _TAG_INT:
+                        container[key] = int(value_values[1][0])
+                        continue
+
+                    container[key] = self._decode_node(pair_values[1], stack)
+                    if len(stack) > depth:
+                        # Fill the child container first
+                        break
+                else:
+                    stack.pop()
+            else:
+                # Decode items, converting int items inline
+                for item in items:
+                    item_values = item[1]
+                    if len(item_values) > 1 and item_values[0][0] == _TAG_INT:
+                        container.append(int(item_values[1][0]))
+                        continue
+
+                    container.append(self._decode_node(item, stack))
+                    if len(stack) > depth:
+                        # Fill the child container first
+                        break
+                else:
+                    stack.pop()
 
-                    decoded_key = self._decode_link(key_link)
-                    decoded_value = self._decode_link(value_link)
+        return result
 
-                    result_dict[decoded_key] = decoded_value
+    def _decode_node(self, link: _Node, stack: List[_DecodeFrame]) -> Any:
+        """
+        Decode a single parsed link.
 
-            return result_dict
+        Lists and dicts are returned empty, with a frame for their contents
+        pushed onto ``stack``.
 
-        else:
-            # Unknown type marker
-            raise ValueError(f"Unknown type marker: {type_marker}")
+        Args:
+            link: Parsed link as an (id, values) node
+            stack: Frames of containers still being filled
 
+        Returns:
+            Decoded Python value
+        """
+        link_id, values = link
+        if not values:
+            # Empty link - this might be a simple id
+            if link_id:
+                return link_id
+            return None
+
+        # Get the type marker from the first value
+        type_marker = values[0][0]
+        if not type_marker:
+            # Not a type marker we recognize
+            return None
 
-# Convenience functions
-_default_codec = ObjectCodec()
+        decoder = self._DECODERS.get(type_marker)
+        if decoder is None:
+            # Unknown type marker
+            raise ValueError(f"Unknown type marker: {type_marker}")
+        return decoder(self, values, stack)
+
+    def _decode_none(self, values: List[Any], stack: List[_DecodeFrame]) -> None:
+        """Decode a None link."""
+        return None
+
+    def _decode_bool(self, values: List[Any], stack: List[_DecodeFrame]) -> bool:
+        """Decode a bool link."""
+        if len(values) > 1:
+            return values[1][0] == "True"
+        return False
+
+    def _decode_int(self, values: List[Any], stack: List[_DecodeFrame]) -> int:
+        """Decode an int link."""
+        if len(values) > 1:
+            return int(values[1][0])
+        return 0
+
+    def _decode_float(self, values: List[Any], stack: List[_DecodeFrame]) -> float:
+        """Decode a float link, including the special NaN and infinity values."""
+        if len(values) > 1:
+            return _float_from_text(values[1][0])
+        return 0.0
+
+    def _decode_str(self, values: List[Any], stack: List[_DecodeFrame]) -> str:
+        """Decode a base64-encoded str link."""
+        if len(values) > 1:
+            return self._str_from_payload(values[1][0])
+        return ""
+
+    def _str_from_payload(self, b64_str: str) -> str:
+        """Decode the base64 payload of a str link."""
+        try:
+            size = len(b64_str)
+            if size <= _B64_DECODE_CACHE_MAX_LENGTH:
+                return _b64decode_short_str(b64_str)
+            if size > _B64_DECODE_MEMO_MAX_LENGTH:
+                return _b64decode_str(b64_str)
+
+            # Medium strings are shared within this decode only
+            value = self._decode_str_memo.get(b64_str)
+            if value is None:
+                value = _b64decode_str(b64_str)
+                self._decode_str_memo[b64_str] = value
+            return value
+        except ValueError:
+            # Invalid base64 (binascii.Error), non-ASCII payloads or invalid
+            # UTF-8 (UnicodeDecodeError): return the raw value
+            return b64_str
+
+    def _decode_ref(self, values: List[Any], stack: List[_DecodeFrame]) -> Any:
+        """Decode a reference to a previously decoded list or dict."""
+        if len(values) > 1:
+            # The memo only holds lists and dicts, so None means "missing"
+            target = self._decode_memo.get(values[1][0])
+            if target is not None:
+                return target
+        raise ValueError("Unknown reference in link")
+
+    def _decode_list(self, values: List[Any], stack: List[_DecodeFrame]) -> List[Any]:
+        """Create the list for a list link and queue its items for decoding."""
+        if len(values) < 2:
+            return []
+
+        ref_id = values[1][0]
+
+        # Create the list object first (to handle circular references)
+        result: List[Any] = []
+        if ref_id:
+            self._decode_memo[ref_id] = result
+
+        if len(values) > 2:
+            stack.append((result, islice(values, 2, None), False))
+        return result
+
+    def _decode_dict(self, values: List[Any], stack: List[_DecodeFrame]) -> Dict[Any, Any]:
+        """Create the dict for a dict link and queue its pairs for decoding."""
+        if len(values) < 2:
+            return {}
+
+        ref_id = values[1][0]
+
+        # Create the dict object first (to handle circular references)
+        result: Dict[Any, Any] = {}
+        if ref_id:
+            self._decode_memo[ref_id] = result
+
+        if len(values) > 2:
+            stack.append((result, islice(values, 2, None), True))
+        return result
+
+    # Dispatch tables keyed by exact Python type and by type marker
+    _ENCODERS: ClassVar[Dict[type, Callable[..., Optional[_EncodeFrame]]]] = {
+        type(None): _encode_none,
+        bool: _encode_bool,
+        int: _encode_int,
+        float: _encode_float,
+        str: _encode_str,
+        list: _encode_list,
+        dict: _encode_dict,
+    }
+
+    _DECODERS: ClassVar[Dict[str, Callable[..., Any]]] = {
+        TYPE_NONE: _decode_none,
+        TYPE_BOOL: _decode_bool,
+        TYPE_INT: _decode_int,
+        TYPE_FLOAT: _decode_float,
+        TYPE_STR: _decode_str,
+        TYPE_REF: _decode_ref,
+        TYPE_LIST: _decode_list,
+        TYPE_DICT: _decode_dict,
+    }
+
+
+# Convenience functions share one codec per thread, since a codec keeps
+# per-call state (its memos) on the instance while encoding or decoding
+_local = threading.local()
+
+
+def _default_codec() -> ObjectCodec:
+    """Return the calling thread's codec for the module-level functions."""
+    try:
+        return _local.codec
+    except AttributeError:
+        codec = _local.codec = ObjectCodec()
+        return codec
 
 
 def encode(obj: Any) -> str:
@@ -322,17 +1029,54 @@ def encode(obj: Any) -> str:
     Returns:
         String representation in Links Notation format
     """
-    return _default_codec.encode(obj)
+    return _default_codec().encode(obj)
+
+
+def encode_to_writer(obj: Any, writer: Any) -> None:
+    """
+    Encode a Python object to Links Notation, streaming it to a writer.
+
+    Args:
+        obj: The Python object to encode
+        writer: Object with a ``write(str)`` method, such as a text file
+    """
+    _default_codec().encode_to_writer(obj, writer)
 
 
-def decode(notation: str) -> Any:
+def encode_many(objs: Iterable[Any]) -> List[str]:
+    """
+    Encode several Python objects to Links Notation format.
+
+    Args:
+        objs: The Python objects to encode
+
+    Returns:
+        One Links Notation string per object, in order
+    """
+    return _default_codec().encode_many(objs)
+
+
+def decode(notation: Union[str, bytes]) -> Any:
     """
     Decode Links Notation format to a Python object.
 
     Args:
-        notation: String in Links Notation format
+        notation: String in Links Notation format, or its UTF-8 bytes
 
     Returns:
         Reconstructed Python object
     """
-    return _default_codec.decode(notation)
+    return _default_codec().decode(notation)
+
+
+def decode_many(notations: Iterable[Union[str, bytes]]) -> List[Any]:
+    """
+    Decode several Links Notation strings to Python objects.
+
+    Args:
+        notations: Strings in Links Notation format, or their UTF-8 bytes
+
+    Returns:
+        One reconstructed Python object per notation, in order
+    """
+    return _default_codec().decode_many(notations)
@@ -195,3 +195,32 @@ class TestStrings:
             encoded = encode(value)
             decoded = decode(encoded)
             assert decoded == value
+
+    def test_roundtrip_long_string(self):
+        """Test roundtrip of strings longer than the cached encoding limit."""
+        test_values = ["x" * 64, "y" * 65, "long unicode 🌍 " * 100]
+        for value in test_values:
+            encoded = encode(value)
+            decoded = decode(encoded)
+            assert decoded == value
+            # Encoding again yields the same text
+            assert encode(value) == encoded
+
+    def test_decode_repeated_strings(self):
+        """Test decoding repeated strings around the cached decoding limit."""
+        # 66 bytes is the longest payload decoded through the cache
+        value = ["a" * 66, "b" * 67, "é" * 33, "a" * 66, "b" * 67, "é" * 33]
+        assert decode(encode(value)) == value
+        assert decode(encode({"a" * 66: 1, "b" * 67: 2})) == {"a" * 66: 1, "b" * 67: 2}
+
+    def test_decoded_repeats_share_one_object(self):
+        """Test that repeated strings up to 1 KiB decode to a single object."""
+        for text in ["short", "m" * 500, "é" * 512]:
+            decoded = decode(encode([text, {"key": text}, text]))
+            assert decoded[0] == text
+            assert decoded[0] is decoded[1]["key"] is decoded[2]
+
+        # Longer strings are decoded independently
+        text = "l" * 2000
+        decoded = decode(encode([text, text]))
+        assert decoded == [text, text]
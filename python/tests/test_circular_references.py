@@ -1,6 +1,8 @@
 """Tests for encoding/decoding objects with circular references."""
 
-from link_notation_objects_codec import decode, encode
+import gc
+
+from link_notation_objects_codec import ObjectCodec, decode, encode
 
 
 class TestCircularReferences:
@@ -138,3 +140,54 @@ class TestCircularReferences:
         assert decoded["child"]["child"]["child"]["level"] == 4
         # Check circular reference back to root
         assert decoded["child"]["child"]["child"]["root"] is decoded
+
+    def test_shared_object_encoded_once(self):
+        """Test that later occurrences of a shared object are emitted as references."""
+        shared = list(range(100))
+        encoded = encode([shared, shared, shared])
+
+        assert encoded.count("(int 99)") == 1
+        assert encoded.count("(ref obj_1)") == 2
+
+    def test_exponentially_shared_graph(self):
+        """Test that sharing at every level keeps the output linear in size."""
+        node = ["leaf"]
+        for _ in range(40):
+            node = [node, node]
+
+        encoded = encode(node)
+        decoded = decode(encoded)
+
+        assert encoded.count("(ref ") == 40
+        level = decoded
+        for _ in range(40):
+            assert level[0] is level[1]
+            level = level[0]
+        assert level == ["leaf"]
+
+    def test_temporary_containers_not_confused(self):
+        """Test that containers freed during encoding are not mistaken for shared ones."""
+
+        class Fresh(list):
+            def __iter__(self):
+                # Each item is a new list that is dropped once encoded
+                for _ in range(3):
+                    yield [1]
+
+        encoded = encode(Fresh())
+
+        assert "(ref " not in encoded
+        decoded = decode(encoded)
+        assert decoded == [[1], [1], [1]]
+        assert decoded[0] is not decoded[1]
+
+    def test_codec_releases_objects_after_call(self):
+        """Test that a codec holds no references to encoded or decoded objects."""
+        codec = ObjectCodec()
+        value = [[1], {"a": [2]}]
+        decoded = codec.decode(codec.encode(value))
+
+        # None of the codec's memos or lists may still refer to the objects
+        held = {id(getattr(codec, name)) for name in ObjectCodec.__slots__}
+        for obj in (value, value[0], value[1], decoded, decoded[0], decoded[1]):
+            assert not held & {id(referrer) for referrer in gc.get_referrers(obj)}
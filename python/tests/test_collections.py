@@ -1,5 +1,10 @@
 """Tests for encoding/decoding collection types (lists and dicts)."""
 
+import sys
+from collections import OrderedDict
+
+import pytest
+
 from link_notation_objects_codec import decode, encode
 
 
@@ -188,6 +193,24 @@ class TestComplexStructures:
         decoded = decode(encoded)
         assert decoded == value
 
+    def test_nesting_beyond_recursion_limit(self):
+        """Test that nesting depth is not bounded by the recursion limit."""
+        depth = sys.getrecursionlimit() * 2
+        value = []
+        inner = value
+        for _ in range(depth):
+            child = []
+            inner.append({"next": child})
+            inner = child
+
+        decoded = decode(encode(value))
+        # Walk the result by hand, since == would itself recurse
+        inner = decoded
+        for _ in range(depth):
+            assert len(inner) == 1
+            inner = inner[0]["next"]
+        assert inner == []
+
     def test_json_like_object(self):
         """Test encoding/decoding typical JSON-like object."""
         value = {
@@ -208,3 +231,50 @@ class TestComplexStructures:
         encoded = encode(value)
         decoded = decode(encoded)
         assert decoded == value
+
+
+class TestTypeDispatch:
+    """Tests for dispatching subclasses and unsupported types."""
+
+    def test_dict_subclass(self):
+        """Test that dict subclasses are encoded as dicts."""
+        value = OrderedDict([("b", 1), ("a", 2)])
+        decoded = decode(encode(value))
+        assert decoded == {"b": 1, "a": 2}
+        assert type(decoded) is dict
+
+    def test_list_subclass(self):
+        """Test that list subclasses are encoded as lists."""
+
+        class MyList(list):
+            pass
+
+        decoded = decode(encode(MyList([1, 2])))
+        assert decoded == [1, 2]
+        assert type(decoded) is list
+
+    def test_containers_iterated_once(self):
+        """Test that encoding walks each container a single time."""
+        iterations = []
+
+        class CountingList(list):
+            def __iter__(self):
+                iterations.append(self)
+                return super().__iter__()
+
+        inner = CountingList([1, 2])
+        outer = CountingList([inner, inner, {"x": inner}])
+        assert decode(encode(outer)) == [[1, 2], [1, 2], {"x": [1, 2]}]
+        assert len(iterations) == 2
+
+    def test_unsupported_type(self):
+        """Test that unsupported types raise TypeError."""
+        with pytest.raises(TypeError):
+            encode(object())
+        with pytest.raises(TypeError):
+            encode([1, (2, 3)])
+
+    def test_unknown_type_marker(self):
+        """Test that unknown type markers raise ValueError."""
+        with pytest.raises(ValueError):
+            decode("(complex 1j)")
@@ -0,0 +1,110 @@
+"""Tests for the exact Links Notation text produced by the encoder."""
+
+import io
+import math
+
+import pytest
+from links_notation import Parser, format_links
+
+from link_notation_objects_codec import ObjectCodec, encode, encode_many, encode_to_writer
+
+
+class TestEncodedFormat:
+    """Tests pinning the encoded text for each supported type."""
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            (None, "(None)"),
+            (True, "(bool True)"),
+            (False, "(bool False)"),
+            (42, "(int 42)"),
+            (-7, "(int -7)"),
+            (3.14, "(float 3.14)"),
+            (math.inf, "(float Infinity)"),
+            (-math.inf, "(float -Infinity)"),
+            (math.nan, "(float NaN)"),
+            ("", "(str )"),
+            ("hello", "(str aGVsbG8=)"),
+            ([], "(list obj_0)"),
+            ({}, "(dict obj_0)"),
+            ([1, "a"], "(list obj_0 (int 1) (str YQ==))"),
+            ({"a": 1}, "(dict obj_0 ((str YQ==) (int 1)))"),
+            ([[], {}], "(list obj_0 (list obj_1) (dict obj_2))"),
+            (
+                [-6, -5, 0, 256, 257],
+                "(list obj_0 (int -6) (int -5) (int 0) (int 256) (int 257))",
+            ),
+            ({"a": -5, "b": 257}, "(dict obj_0 ((str YQ==) (int -5)) ((str Yg==) (int 257)))"),
+            (["a", "b", ""], "(list obj_0 (str YQ==) (str Yg==) (str ))"),
+            (
+                [0.5, math.nan, -math.inf],
+                "(list obj_0 (float 0.5) (float NaN) (float -Infinity))",
+            ),
+            ([True, False], "(list obj_0 (bool True) (bool False))"),
+            ([True, 1, "a"], "(list obj_0 (bool True) (int 1) (str YQ==))"),
+            ([1000, -7, 2**70], "(list obj_0 (int 1000) (int -7) (int 1180591620717411303424))"),
+            ([1000, True], "(list obj_0 (int 1000) (bool True))"),
+            ({"k": ["a"]}, "(dict obj_0 ((str aw==) (list obj_1 (str YQ==))))"),
+        ],
+    )
+    def test_encoded_text(self, value, expected):
+        """Test that values encode to the expected notation."""
+        assert encode(value) == expected
+
+    def test_self_reference_text(self):
+        """Test the notation emitted for a self-referencing list."""
+        lst = []
+        lst.append(lst)
+        assert encode(lst) == "(list obj_0 (ref obj_0))"
+
+    def test_shared_reference_text(self):
+        """Test the notation emitted for an object shared between containers."""
+        shared = {"x": 1}
+        assert encode([shared, shared]) == (
+            "(list obj_0 (dict obj_1 ((str eA==) (int 1))) (ref obj_1))"
+        )
+
+    def test_object_ids_past_preformatted_range(self):
+        """Test that object IDs keep counting beyond the preformatted ones."""
+        shared = []
+        value = [[] for _ in range(1500)] + [shared, shared]
+        encoded = encode(value)
+        assert encoded.endswith("(list obj_1500) (list obj_1501) (ref obj_1501))")
+
+    def test_matches_links_notation_formatter(self):
+        """Test that the output is the canonical links-notation formatting."""
+        data = {
+            "users": [{"id": 1, "name": "Alice"}, {"id": 2, "name": "Bob"}],
+            "flags": [True, False, None],
+            "ratio": 0.5,
+            "text": "multi\nline (with) 'quotes': \"here\"",
+        }
+        encoded = encode(data)
+        assert format_links(Parser().parse(encoded)) == encoded
+
+    def test_encode_to_writer(self):
+        """Test that streaming to a writer produces the same text as encode."""
+        shared = {"x": [1, 2.5, None]}
+        data = {"a": shared, "b": [shared, "text", True]}
+        buffer = io.StringIO()
+        encode_to_writer(data, buffer)
+        assert buffer.getvalue() == encode(data)
+
+    def test_encode_many(self):
+        """Test that each object in a batch is encoded independently."""
+        shared = [1]
+        values = [shared, {"a": shared}, "text"]
+        assert encode_many(values) == [encode(value) for value in values]
+        assert encode_many([shared, shared]) == ["(list obj_0 (int 1))"] * 2
+        assert encode_many([]) == []
+
+    def test_register_keys(self):
+        """Test that registered keys don't change the encoded text."""
+        long_key = "k" * 100
+        records = [{"id": n, "name": "x", long_key: None, 1: 2} for n in range(3)]
+        codec = ObjectCodec()
+        codec.register_keys(["id", "name", long_key])
+        assert codec.encode(records) == encode(records)
+        with pytest.raises(TypeError):
+            codec.register_keys([1])
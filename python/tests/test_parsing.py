@@ -0,0 +1,86 @@
+"""Tests for parsing Links Notation input during decoding."""
+
+import pytest
+
+from link_notation_objects_codec import decode, decode_many, encode
+
+
+class TestNotationParsing:
+    """Tests for the decoder's notation parsing."""
+
+    def test_surrounding_whitespace(self):
+        """Test that whitespace around the top-level link is ignored."""
+        assert decode("  (int 42)  ") == 42
+        assert decode("(list obj_0 (int 1))\n") == [1]
+
+    def test_extra_spaces_between_values(self):
+        """Test that repeated spaces between values are accepted."""
+        assert decode("(list  obj_0   (int 1)  (int 2) )") == [1, 2]
+
+    def test_empty_notation(self):
+        """Test that empty notation decodes to None."""
+        assert decode("") is None
+
+    def test_unparenthesized_link(self):
+        """Test notation without outer parentheses falls back to the full parser."""
+        assert decode("int 42") == 42
+
+    def test_multiple_top_level_links(self):
+        """Test that only the first top-level link is decoded."""
+        assert decode("(int 1)\n(int 2)") == 1
+
+    def test_roundtrip_matches_full_parser(self):
+        """Test that the fast parser and the full parser agree on encoder output."""
+        data = {"items": [1, 2.5, "text", None, True], "nested": {"key": []}}
+        encoded = encode(data)
+        # A trailing newline routes decoding through the links-notation parser
+        assert decode(encoded) == decode(encoded + "\n") == data
+
+    def test_decode_bytes(self):
+        """Test decoding notation given as bytes."""
+        data = {"key": ["value", 1, None]}
+        encoded = encode(data)
+        assert decode(encoded.encode("utf-8")) == data
+        assert decode(bytearray(encoded, "utf-8")) == data
+
+    def test_decode_many(self):
+        """Test decoding a batch of notations, given as str or bytes."""
+        notations = [encode([1, "a"]), encode({"k": None}).encode("utf-8"), "(int 7)"]
+        assert decode_many(notations) == [[1, "a"], {"k": None}, 7]
+        assert decode_many(iter([])) == []
+
+    @pytest.mark.parametrize(
+        "notation, expected",
+        [
+            ("(list obj_0 abc (int 1))", ["abc", 1]),
+            ("(dict obj_0 (k (int 1)))", {"k": 1}),
+            ("(list obj_0 ((int 1)))", [None]),
+            ("(list obj_0 ())", [None]),
+            ("(int)", 0),
+            ("(list obj_0 (int) (bool))", [0, False]),
+            ("(dict obj_0 ((str YQ==) x (int 5)))", {"a": "x"}),
+            ("(int 5 6)", 5),
+            ("(None 1)", None),
+            ("(str )", ""),
+            ("(float)", 0.0),
+            ("(int )", 0),
+            ("(float )", 0.0),
+            (" (bool True) ", True),
+        ],
+    )
+    def test_atom_and_link_values(self, notation, expected):
+        """Test that bare atoms and nested links decode the same on both parsers."""
+        assert decode(notation) == expected
+        assert decode(notation + "\n") == expected
+
+    def test_unknown_reference(self):
+        """Test that a reference to an undefined object raises ValueError."""
+        with pytest.raises(ValueError):
+            decode("(list obj_0 (ref obj_9))")
+
+    def test_invalid_str_payload(self):
+        """Test that a str payload that isn't valid base64 UTF-8 is returned as is."""
+        assert decode("(str abc)") == "abc"
+        assert decode("(list obj_0 (str //79) (str é))") == ["//79", "é"]
+        # Data after the padding is ignored, whichever base64 backend is installed
+        assert decode("(list obj_0 (str YQ==YQ==))") == ["a"]
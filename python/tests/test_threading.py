@@ -0,0 +1,24 @@
+"""Tests for using the module-level functions from multiple threads."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from link_notation_objects_codec import decode, encode
+
+
+class TestThreading:
+    """Tests for concurrent encode/decode calls."""
+
+    def test_concurrent_roundtrips(self):
+        """Test that concurrent calls don't share encode/decode state."""
+
+        def roundtrip(n):
+            shared = {"n": n}
+            value = [shared, [shared, list(range(n))], {"self": shared}]
+            for _ in range(50):
+                decoded = decode(encode(value))
+                assert decoded == value
+                assert decoded[0] is decoded[1][0] is decoded[2]["self"]
+            return n
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            assert sorted(pool.map(roundtrip, range(32))) == list(range(32))